@@ -0,0 +1,228 @@
+import os
+import json
+import queue
+import time
+import asyncio
+import datetime
+import tomllib
+from contextlib import asynccontextmanager, contextmanager
+
+import pandas as pd
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+
+# Importowanie modułów (te same co w app.py)
+from modules import storage
+from modules.bulk_import import validate_orders, existing_hashes, split_new_orders
+from modules.average_time import average_time_table
+from modules.reports import seal_rollup
+from modules.throughput import ThroughputModel
+from modules.calculator import add_work_minutes
+
+# Headless API: uruchomienie -> uvicorn api:app --host 0.0.0.0 --port 8000
+POOL_SIZE = int(os.environ.get("PMA_POOL_SIZE", "4"))
+API_KEY = os.environ.get("PMA_API_KEY")
+CACHE_TTL = float(os.environ.get("PMA_CACHE_TTL", "60"))  # Sekundy do ponownego wczytania zapisów z UI
+GROUP_COLUMNS = ['Seal Type', 'Company', 'Operator']
+
+
+def load_credentials():
+    # 🔑 Te same dane logowania co aplikacja Streamlit (.streamlit/secrets.toml) lub plik JSON
+    credentials_file = os.environ.get("GCP_SERVICE_ACCOUNT_FILE")
+    if credentials_file:
+        with open(credentials_file) as f:
+            return json.load(f)
+    with open(os.environ.get("PMA_SECRETS_FILE", ".streamlit/secrets.toml"), "rb") as f:
+        return tomllib.load(f)["gcp_service_account"]
+
+
+class ClientPool:
+    # 🔥 Pula autoryzowanych klientów gspread (każdy ma własną sesję HTTP) - bez logowania przy każdym żądaniu
+    def __init__(self, credentials, size):
+        self.clients = queue.Queue()
+        for _ in range(size):
+            self.clients.put(storage.connect_to_gsheets(credentials))
+
+    @contextmanager
+    def client(self):
+        client = self.clients.get()
+        try:
+            yield client
+        finally:
+            self.clients.put(client)
+
+
+class OrderStore:
+    def __init__(self, pool):
+        self.pool = pool
+        self.orders = None
+        self.hashes = set()  # Hasze zleceń do deduplikacji - aktualizowane przy każdym imporcie
+        self.loaded_at = 0.0
+        self.model = None
+        self.model_orders = None  # Ramka, z której zbudowano model - nowa ramka po wczytaniu = nowy model
+        self.write_lock = asyncio.Lock()
+
+    def _load(self):
+        with self.pool.client() as client:
+            orders = storage.load_orders(client)
+        return orders, existing_hashes(orders)
+
+    def _append(self, dataframe):
+        with self.pool.client() as client:
+            storage.append_orders(client, dataframe)
+
+    def _prepare(self, raw, default_operator):
+        accepted, rejected = validate_orders(raw, default_operator)
+        new_orders, duplicates, new_hashes = split_new_orders(accepted, self.hashes)
+        return new_orders, duplicates, rejected, new_hashes
+
+    def _merge(self, orders, new_orders):
+        # 🔑 Nowa wersja modelu - równoległe /estimate czytają poprzednią bez blokady
+        model = self.model
+        if model is not None:
+            model = model.updated(new_orders.to_dict('records'))
+        return pd.concat([orders, new_orders], ignore_index=True), model
+
+    async def get_orders(self):
+        # 📦 Dane trzymane w pamięci - arkusz czytany ponownie dopiero po CACHE_TTL
+        if self.orders is None or time.monotonic() - self.loaded_at > CACHE_TTL:
+            self.orders, self.hashes = await run_in_threadpool(self._load)
+            self.loaded_at = time.monotonic()
+        return self.orders
+
+    async def get_model(self):
+        orders = await self.get_orders()
+        if self.model is None or self.model_orders is not orders:
+            self.model = await run_in_threadpool(ThroughputModel.from_dataframe, orders)
+            self.model_orders = orders
+        return self.model
+
+    async def ingest(self, raw, default_operator):
+        async with self.write_lock:  # Zapisy jeden po drugim, żeby deduplikacja widziała poprzednie paczki
+            orders = await self.get_orders()
+            # ⚡ Walidacja i haszowanie (pandas) poza pętlą zdarzeń
+            new_orders, duplicates, rejected, new_hashes = await run_in_threadpool(self._prepare, raw, default_operator)
+            if not new_orders.empty:
+                await run_in_threadpool(self._append, new_orders)
+                self.orders, self.model = await run_in_threadpool(self._merge, orders, new_orders)
+                self.model_orders = self.orders
+                self.hashes.update(new_hashes)
+            return new_orders, duplicates, rejected
+
+
+class OrdersIn(BaseModel):
+    orders: list[dict]
+    operator: str = ""
+
+
+class EstimateOrder(BaseModel):
+    company: str
+    seal_type: str
+    quantity: int = Field(gt=0)
+    operator: str | None = None
+
+
+class EstimateIn(BaseModel):
+    orders: list[EstimateOrder]
+    start: datetime.datetime | None = None
+
+
+store = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global store
+    pool = await run_in_threadpool(ClientPool, load_credentials(), POOL_SIZE)
+    store = OrderStore(pool)
+    yield
+
+
+app = FastAPI(title="Production Manager API", lifespan=lifespan)
+
+
+def check_api_key(x_api_key):
+    if API_KEY and x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
+def filter_dates(orders, start, end):
+    dates = pd.to_datetime(orders['Date'], errors='coerce')
+    mask = pd.Series(True, index=orders.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    return orders[mask]
+
+
+def check_group_column(by):
+    if by not in GROUP_COLUMNS + ['Date']:
+        raise HTTPException(status_code=400, detail=f"Unsupported grouping column: {by}")
+
+
+@app.post("/orders")
+async def ingest_orders(payload: OrdersIn, x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    if not payload.orders:
+        raise HTTPException(status_code=400, detail="No orders in request")
+
+    new_orders, duplicates, rejected = await store.ingest(pd.DataFrame(payload.orders), payload.operator)
+    return {
+        "accepted": len(new_orders),
+        "duplicates": len(duplicates),
+        "rejected": json.loads(rejected.to_json(orient='records', date_format='iso')),
+    }
+
+
+@app.get("/averages")
+async def averages(by: str = 'Seal Type', start: datetime.date | None = None, end: datetime.date | None = None,
+                   x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    check_group_column(by)
+    orders = filter_dates(await store.get_orders(), start, end)
+    if orders.empty:
+        return []
+    return json.loads(average_time_table(orders, by).to_json(orient='records', date_format='iso'))
+
+
+@app.get("/rollups")
+async def rollups(by: str = 'Company', start: datetime.date | None = None, end: datetime.date | None = None,
+                  x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    check_group_column(by)
+    orders = filter_dates(await store.get_orders(), start, end)
+    if orders.empty:
+        return []
+    rollup = seal_rollup(orders, by).reset_index()
+    return json.loads(rollup.to_json(orient='records', date_format='iso'))
+
+
+@app.post("/estimate")
+async def estimate(payload: EstimateIn, x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    if not payload.orders:
+        raise HTTPException(status_code=400, detail="No orders in request")
+
+    model = await store.get_model()
+    results = []
+    total_minutes = 0.0
+    for order in payload.orders:
+        stats = model.get(order.company, order.seal_type, order.operator)
+        if stats is None or stats.ewma_upm <= 0:
+            raise HTTPException(status_code=404, detail=f"No production history for {order.company} / {order.seal_type}")
+        minutes = order.quantity / stats.ewma_upm
+        total_minutes += minutes
+        results.append({"company": order.company, "seal_type": order.seal_type, "minutes_per_seal": 1 / stats.ewma_upm, "minutes": minutes})
+
+    # 📅 Ten sam kalendarz zmian co w kalkulatorze (typ uszczelki ostatniego zlecenia)
+    start = payload.start or datetime.datetime.now()
+    completion = add_work_minutes(start, total_minutes, payload.orders[-1].seal_type)
+    if completion is None:
+        raise HTTPException(status_code=422, detail="Orders do not fit within the 365-day planning limit")
+    return {
+        "orders": results,
+        "total_minutes": total_minutes,
+        "estimated_completion": completion.isoformat(),
+    }
@@ -1,10 +1,14 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 
 # Importowanie modułów
+from modules import storage, sync
+from modules.dataset import SharedDataset
+from modules.throughput import ThroughputModel
+from modules.downtime import DowntimeAggregates
+from modules.order_lookup import OrderIndex
+from modules.admin import show_admin_panel
 from modules.reports import show_reports
 from modules.charts import show_charts
 from modules.backup import show_backup_option
@@ -12,6 +16,8 @@ from modules.user_management import show_user_management
 from modules.average_time import calculate_average_time
 from modules.calculator import show_calculator
 from modules.form import show_form  # ✅ Import formularza z modułu
+from modules.downtime import show_downtime
+from modules.bulk_import import OrderHashes, show_bulk_import
 
 # Konfiguracja aplikacji
 st.set_page_config(page_title="Production Manager App", layout="wide")
@@ -23,62 +29,132 @@ if 'user' not in st.session_state:
 
 # Funkcja połączenia z Google Sheets
 def connect_to_gsheets():
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive"
-    ]
-
-    credentials = st.secrets["gcp_service_account"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials, scope)
-    client = gspread.authorize(creds)
-    
-    return client
+    return storage.connect_to_gsheets(st.secrets["gcp_service_account"])
+
+# Funkcja ładowania danych użytkowników z Google Sheets (wspólne dla wszystkich sesji)
+@st.cache_resource(ttl=300)
+def load_shared_users():
+    return storage.load_users(connect_to_gsheets())
 
-# Funkcja ładowania danych użytkowników z Google Sheets
 def load_users():
-    client = connect_to_gsheets()
     try:
-        sheet = client.open("ProductionManagerApp").worksheet("Users")
-        data = sheet.get_all_records()
-        if data:
-            return pd.DataFrame(data)
+        return load_shared_users()
     except Exception as e:
         st.error(f"❌ Error loading users: {e}")
-    return pd.DataFrame(columns=['Username', 'Password', 'Role'])
+    return pd.DataFrame(columns=storage.USER_COLUMNS)
+
+# Funkcja zapisywania użytkowników do Google Sheets
+def save_users_to_gsheets(users_df):
+    storage.save_users(connect_to_gsheets(), users_df)
+    load_shared_users.clear()
+
+    # Backup lokalny
+    users_df.to_excel("users_backup.xlsx", index=False)
 
-# Funkcja ładowania danych produkcyjnych z Google Sheets
-def load_data_from_gsheets():
-    client = connect_to_gsheets()
+# Funkcja ładowania danych produkcyjnych - jeden zbiór danych na proces, sesje tylko go czytają
+@st.cache_resource
+def load_shared_dataset():
+    return SharedDataset(storage.open_spreadsheet(connect_to_gsheets()))
+
+def get_dataset():
     try:
-        sheet = client.open("ProductionManagerApp").sheet1
-        data = sheet.get_all_records()
-        if data:
-            df = pd.DataFrame(data)
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date  # ✅ Tylko data, bez godzin
-            df = df.dropna(subset=['Date'])
-            return df
+        return load_shared_dataset()
     except Exception as e:
         st.error(f"❌ Error loading production data: {e}")
-    return pd.DataFrame(columns=['Date', 'Company', 'Operator', 'Seal Type', 'Seal Count', 'Profile', 'Production Time', 'Downtime', 'Reason for Downtime'])
+    return None
 
 # Funkcja zapisywania danych do Google Sheets
 def save_data_to_gsheets(dataframe):
-    client = connect_to_gsheets()
-    sheet = client.open("ProductionManagerApp").sheet1
-    dataframe = dataframe.astype(str)
-    sheet.clear()
-    sheet.update([dataframe.columns.values.tolist()] + dataframe.values.tolist())
+    storage.save_orders(connect_to_gsheets(), dataframe)
+    if dataset is not None:
+        st.session_state.data_version = dataset.refresh(force=True)
+
+# Funkcja dopisywania wierszy do Google Sheets (duże paczki zamiast przepisywania arkusza)
+def append_rows_to_gsheets(dataframe):
+    storage.append_orders(connect_to_gsheets(), dataframe)
+    if dataset is not None:
+        st.session_state.data_version = dataset.refresh(force=True, appended=len(dataframe))
+
+# Wynik zapisu jednego zlecenia - True, jeśli arkusz został zmieniony
+def order_saved(status):
+    if status == storage.ORDER_NOT_FOUND:
+        st.warning("⚠️ This order no longer exists in the sheet. Please refresh the page.")
+        return False
+    if dataset is not None:
+        st.session_state.data_version = dataset.refresh(force=True)
+    return True
+
+# Funkcja edycji jednego zlecenia po Order ID
+def update_order_in_gsheets(order_id, values):
+    status = storage.update_order(connect_to_gsheets(), order_id, values)
+    if status == storage.NO_ORDER_ID_COLUMN:
+        # Arkusz bez kolumny Order ID - jednorazowo przepisujemy całość (zapisuje też identyfikatory)
+        dataframe = df.copy()
+        selected = dataframe['Order ID'] == order_id
+        for column, value in values.items():
+            dataframe.loc[selected, column] = value
+        save_data_to_gsheets(dataframe)
+        return True
+    return order_saved(status)
+
+# Funkcja usuwania jednego zlecenia po Order ID
+def delete_order_from_gsheets(order_id):
+    status = storage.delete_order(connect_to_gsheets(), order_id)
+    if status == storage.NO_ORDER_ID_COLUMN:
+        save_data_to_gsheets(df[df['Order ID'] != order_id])
+        return True
+    return order_saved(status)
+
+# Statystyki wyliczane raz na wersję danych i współdzielone przez sesje
+def get_throughput_model():
+    if dataset is None:
+        return ThroughputModel()
+    return dataset.get_derived(snapshot, 'throughput', ThroughputModel.from_dataframe)
+
+def get_downtime_aggregates():
+    if dataset is None:
+        return DowntimeAggregates()
+    return dataset.get_derived(snapshot, 'downtime', DowntimeAggregates.from_dataframe)
+
+def get_order_index():
+    if dataset is None:
+        return OrderIndex.from_dataframe(df)
+    return dataset.get_derived(snapshot, 'order_index', OrderIndex.from_dataframe)
+
+def get_order_hashes():
+    if dataset is None:
+        return OrderHashes.from_dataframe(df)
+    return dataset.get_derived(snapshot, 'order_hashes', OrderHashes.from_dataframe)
+
+# 🔄 Sprawdzanie w tle, czy ktoś inny zapisał dane - pełne odświeżenie tylko przy zmianie
+@st.fragment(run_every=sync.POLL_INTERVAL)
+def watch_for_changes():
+    try:
+        version = dataset.refresh()
+    except Exception as e:
+        st.warning(f"⚠️ Could not check for data updates: {e}")
+        return
+    if version != st.session_state.data_version:
+        st.session_state.data_version = version
+        st.toast("🔄 Production data was updated by another user.")
+        st.rerun(scope="app")
 
 # Wczytanie użytkowników i danych produkcyjnych
 users_df = load_users()
-df = load_data_from_gsheets()
-# Funkcja logowania
+dataset = get_dataset()
+if dataset is not None:
+    snapshot = dataset.snapshot()  # 🔑 Ramka i statystyki z jednej wersji - bez kopii na sesję
+    st.session_state.data_version = snapshot.version
+    df = snapshot.frame
+    watch_for_changes()
+else:
+    df = pd.DataFrame(columns=storage.ORDER_COLUMNS)
+
+# Funkcja logowania - w sesji trzymamy tylko nazwę i rolę użytkownika
 def login(username, password, users_df):
     user = users_df[(users_df['Username'] == username) & (users_df['Password'] == password)]
     if not user.empty:
-        return user.iloc[0]
+        return {'Username': user.iloc[0]['Username'], 'Role': user.iloc[0]['Role']}
     return None
 
 # Panel logowania
@@ -100,8 +176,8 @@ else:
     if st.sidebar.button("Logout"):
         st.session_state.user = None
 
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "Home", "Production Charts", "Calculator", "User Management", "Reports", "Average Production Time"
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
+        "Home", "Production Charts", "Calculator", "User Management", "Reports", "Average Production Time", "Downtime", "Bulk Import"
     ])
 
     # Zakładka Home
@@ -126,7 +202,10 @@ else:
                     average_order_days = total_seals / unique_order_days
                     st.write(f"### 📈 Avg. Daily Production (Order Dates Only): {average_order_days:.2f} seals per day")
 
-        df = show_form(df, save_data_to_gsheets)
+        df = show_form(df, append_rows_to_gsheets)
+
+        if st.session_state.user is not None and st.session_state.user['Role'] == 'Admin':
+            show_admin_panel(df, get_order_index(), update_order_in_gsheets, delete_order_from_gsheets)
 
     with tab2:
         if st.session_state.user is not None:
@@ -142,13 +221,13 @@ else:
 
     with tab3:
         if st.session_state.user is not None:
-            show_calculator(df)
+            show_calculator(df, get_throughput_model())
         else:
             st.warning("🔒 Please log in to access the Calculator.")
 
     with tab4:
         if st.session_state.user is not None and st.session_state.user['Role'] == 'Admin':
-            show_user_management(users_df, save_data_to_gsheets)
+            show_user_management(users_df, save_users_to_gsheets)
         else:
             st.warning("🔒 Access restricted to Admins only.")
 
@@ -158,17 +237,15 @@ else:
         else:
             st.warning("🔒 Please log in to view Average Production Time.")
 
+    with tab7:
+        if st.session_state.user is not None:
+            show_downtime(df, get_downtime_aggregates())
+        else:
+            st.warning("🔒 Please log in to view Downtime Analysis.")
 
-
-def save_users_to_gsheets(users_df):
-    client = connect_to_gsheets()
-    try:
-        sheet = client.open("ProductionManagerApp").worksheet("Users")
-    except gspread.exceptions.WorksheetNotFound:
-        sheet = client.open("ProductionManagerApp").add_worksheet(title="Users", rows="100", cols="20")
-    sheet.clear()
-    sheet.update([users_df.columns.values.tolist()] + users_df.values.tolist())
-
-    # Backup lokalny
-    users_df.to_excel("users_backup.xlsx", index=False)
+    with tab8:
+        if st.session_state.user is not None and st.session_state.user['Role'] == 'Admin':
+            df = show_bulk_import(df, get_order_hashes(), append_rows_to_gsheets)
+        else:
+            st.warning("🔒 Access restricted to Admins only.")
 
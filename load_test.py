@@ -0,0 +1,377 @@
+import re
+import sys
+import time
+import random
+import argparse
+import datetime
+import threading
+from collections import defaultdict
+
+import numpy as np
+import gspread
+from gspread.utils import a1_to_rowcol, numericise_all
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from modules import storage
+
+# Test obciążeniowy: N równoległych sesji app.py (AppTest) na lokalnej atrapie Google Sheets.
+# Uruchomienie -> python load_test.py --sessions 20 --actions 30
+APP_PATH = "app.py"
+SEAL_TYPES = ['Standard Soft', 'Standard Hard', 'Custom Soft', 'Custom Hard', 'V-Rings']
+ACTIONS = ['submit', 'calculator', 'tab_switch']
+ACTION_WEIGHTS = [0.4, 0.3, 0.3]
+
+
+class QuotaResponse:
+    # Minimalna odpowiedź HTTP, z której gspread.exceptions.APIError odczytuje błąd
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {"error": {"code": 429, "message": "Quota exceeded for quota metric 'Requests'", "status": "RESOURCE_EXHAUSTED"}}
+
+
+class Backend:
+    # ⏱️ Wspólne opóźnienie, limit zapytań na minutę i losowe błędy dla wszystkich wywołań API
+    def __init__(self, latency_ms, quota_per_minute, error_rate, seed):
+        self.latency = latency_ms / 1000
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.stats = defaultdict(int)
+
+    def call(self, name):
+        with self.lock:
+            now = time.monotonic()
+            self.calls = [t for t in self.calls if now - t < 60]
+            over_quota = len(self.calls) >= self.quota_per_minute
+            failed = self.random.random() < self.error_rate
+            delay = self.random.lognormvariate(0, 0.5) * self.latency
+            self.calls.append(now)
+            self.stats['calls'] += 1
+            self.stats[f'calls.{name}'] += 1
+            if over_quota or failed:
+                self.stats['quota_errors'] += 1
+
+        time.sleep(delay)
+        if over_quota or failed:
+            raise gspread.exceptions.APIError(QuotaResponse())
+
+
+class FakeCell:
+    def __init__(self, row, col):
+        self.row = row
+        self.col = col
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, values=None):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.values = values or []
+        self.col_count = 26
+
+    def _call(self, name, write=False):
+        self.spreadsheet.backend.call(name)
+        if write:
+            with self.spreadsheet.lock:
+                self.spreadsheet.revision += 1
+
+    def get_all_values(self):
+        self._call('get_all_values')
+        with self.spreadsheet.lock:
+            width = max((len(row) for row in self.values), default=0)
+            return [list(row) + [""] * (width - len(row)) for row in self.values]
+
+    def get_all_records(self):
+        values = self.get_all_values()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, numericise_all(row))) for row in values[1:]]
+
+    def _range(self, range_name):
+        # "A10:ZZ" -> od wiersza 10 do końca, "1:1" -> tylko wiersz 1; puste komórki na końcu obcięte jak w API
+        start, end = re.match(r"[A-Z]*(\d+)(?::[A-Z]*(\d+))?", range_name).groups()
+        with self.spreadsheet.lock:
+            rows = [list(row) for row in self.values[int(start) - 1:int(end) if end else None]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        return rows
+
+    def get(self, range_name):
+        self._call('get')
+        return self._range(range_name)
+
+    def batch_get(self, ranges):
+        self._call('batch_get')
+        return [self._range(range_name) for range_name in ranges]
+
+    def row_values(self, row):
+        self._call('row_values')
+        with self.spreadsheet.lock:
+            return list(self.values[row - 1]) if len(self.values) >= row else []
+
+    def find(self, query, in_column=None):
+        self._call('find')
+        with self.spreadsheet.lock:
+            for index, row in enumerate(self.values):
+                if len(row) >= in_column and str(row[in_column - 1]) == str(query):
+                    return FakeCell(index + 1, in_column)
+        return None
+
+    def clear(self):
+        self._call('clear', write=True)
+        with self.spreadsheet.lock:
+            self.values = []
+
+    def update(self, *args, range_name=None, values=None, **kwargs):
+        # gspread 5: update(range_name, values), gspread 6: update(values, range_name) - obsługujemy oba
+        for arg in args:
+            if isinstance(arg, str):
+                range_name = arg
+            else:
+                values = arg
+        self._call('update', write=True)
+        start, col = a1_to_rowcol(range_name or "A1")
+        with self.spreadsheet.lock:
+            while len(self.values) < start - 1 + len(values):
+                self.values.append([])
+            for offset, row in enumerate(values):
+                # Zapis tylko w zakresie od komórki startowej (np. J1 -> sama kolumna J), jak w API
+                cells = self.values[start - 1 + offset]
+                cells.extend([""] * (col - 1 + len(row) - len(cells)))
+                cells[col - 1:col - 1 + len(row)] = [str(value) for value in row]
+
+    def update_cell(self, row, col, value):
+        self._call('update_cell', write=True)
+        with self.spreadsheet.lock:
+            cells = self.values[row - 1]
+            cells.extend([""] * (col - len(cells)))
+            cells[col - 1] = str(value)
+
+    def add_cols(self, cols):
+        self._call('add_cols', write=True)
+        self.col_count += cols
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values, **kwargs):
+        self._call('append_rows', write=True)
+        with self.spreadsheet.lock:
+            self.values.extend([str(value) for value in row] for row in values)
+
+    def delete_rows(self, row):
+        self._call('delete_rows', write=True)
+        with self.spreadsheet.lock:
+            del self.values[row - 1]
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.revision = 0
+        self.worksheets = {}
+
+    @property
+    def sheet1(self):
+        self.backend.call('fetch_sheet_metadata')
+        return self.worksheets['Sheet1']
+
+    def worksheet(self, title):
+        self.backend.call('fetch_sheet_metadata')
+        if title not in self.worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.backend.call('add_worksheet')
+        self.worksheets[title] = FakeWorksheet(self, title)
+        return self.worksheets[title]
+
+    def get_lastUpdateTime(self):
+        self.backend.call('get_lastUpdateTime')
+        return str(self.revision)
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open(self, title):
+        self.spreadsheet.backend.call('open')
+        return self.spreadsheet
+
+
+def seed_spreadsheet(backend, sessions, seed_orders, seed):
+    rng = random.Random(seed)
+    spreadsheet = FakeSpreadsheet(backend)
+
+    users = [list(storage.USER_COLUMNS)] + [[f"operator{i}", "secret", "Operator"] for i in range(sessions)]
+    spreadsheet.worksheets['Users'] = FakeWorksheet(spreadsheet, 'Users', users)
+
+    header = list(storage.ORDER_COLUMNS)
+    today = datetime.date.today()
+    orders = [header]
+    for i in range(seed_orders):
+        seal_type = rng.choice(SEAL_TYPES)
+        orders.append([
+            str(today - datetime.timedelta(days=rng.randint(0, 365))),
+            f"Company {rng.randint(1, 20)}",
+            f"operator{rng.randrange(max(sessions, 1))}",
+            seal_type,
+            str(rng.randint(10, 500)),
+            "Profile A" if seal_type.startswith('Standard') else "N/A",
+            str(round(rng.uniform(30, 480), 1)),
+            str(round(rng.uniform(0, 60), 1)),
+            rng.choice(["N/A", "Tool change", "awaria", "No material", "Break"]),
+            f"seed{i}",
+        ])
+    spreadsheet.worksheets['Sheet1'] = FakeWorksheet(spreadsheet, 'Sheet1', orders)
+    return spreadsheet
+
+
+def widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"Widget '{label}' not found in this run")
+
+
+class Session:
+    def __init__(self, number, args, results):
+        self.number = number
+        self.args = args
+        self.results = results
+        self.random = random.Random(args.seed + number)
+        self.submitted = []
+
+    def timed(self, action, step):
+        start = time.perf_counter()
+        error = None
+        try:
+            at = step()
+            if at.exception:
+                error = at.exception[0].value
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.results.append((action, time.perf_counter() - start, error))
+        return error is None
+
+    def run(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=self.args.timeout)
+        at.secrets["gcp_service_account"] = {}  # Atrapa klienta nie używa danych logowania
+        if not self.timed('load', at.run):
+            return
+
+        def login():
+            widget(at.sidebar.text_input, "Username").input(f"operator{self.number}")
+            widget(at.sidebar.text_input, "Password").input("secret")
+            widget(at.sidebar.button, "Login").click().run()
+            at.run()  # Zakładki i "Logged in as" pojawiają się dopiero w kolejnym przebiegu
+            if not any("Logged in as" in element.value for element in at.sidebar.markdown):
+                raise RuntimeError(f"Login failed for operator{self.number}")
+            return at
+
+        if not self.timed('login', login):
+            return
+
+        for step in range(self.args.actions):
+            action = self.random.choices(ACTIONS, ACTION_WEIGHTS)[0]
+            if action == 'submit':
+                company = f"LoadTest {self.number}-{step}"
+
+                def submit():
+                    widget(at.text_input, "Company Name").input(company)
+                    widget(at.number_input, "Number of Seals").set_value(self.random.randint(10, 200))
+                    widget(at.number_input, "Production Time (Minutes)").set_value(round(self.random.uniform(30, 240), 1))
+                    return widget(at.button, "Save Entry").click().run()
+
+                if self.timed('submit', submit) and any("Order saved" in element.value for element in at.success):
+                    self.submitted.append(company)
+            elif action == 'calculator':
+                def calculate():
+                    select_company = widget(at.selectbox, "Select Company")
+                    select_company.set_value(self.random.choice(select_company.options))
+                    widget(at.number_input, "Order Quantity").set_value(self.random.randint(1, 1000))
+                    return widget(at.button, "Add Order to Calculation").click().run()
+
+                self.timed('calculator', calculate)
+            else:
+                # Wszystkie zakładki są renderowane przy każdym przebiegu - przełączenie to zwykły rerun
+                self.timed('tab_switch', at.run)
+
+
+def report(results, sessions, backend, spreadsheet, elapsed):
+    print(f"\n=== Load test: {len(sessions)} sessions, {elapsed:.1f}s ===")
+    print(f"{'action':<12}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    by_action = defaultdict(list)
+    for action, seconds, error in results:
+        by_action[action].append((seconds, error))
+    for action, entries in sorted(by_action.items()):
+        latencies = np.array([seconds for seconds, _ in entries]) * 1000
+        errors = sum(error is not None for _, error in entries)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(f"{action:<12}{len(entries):>8}{errors:>8}{p50:>10.0f}{p90:>10.0f}{p99:>10.0f}")
+
+    print(f"\nThroughput: {len(results) / elapsed:.2f} actions/s")
+    print(f"Backend calls: {backend.stats['calls']} ({backend.stats['calls'] / elapsed:.1f}/s), quota errors: {backend.stats['quota_errors']}")
+
+    # 🔍 Zapisy zgłoszone jako udane, których nie ma w arkuszu (np. nadpisane przez równoległy zapis całego arkusza)
+    companies = {row[1] for row in spreadsheet.worksheets['Sheet1'].values[1:] if len(row) > 1}
+    submitted = [company for session in sessions for company in session.submitted]
+    lost = [company for company in submitted if company not in companies]
+    print(f"Writes: {len(submitted)} confirmed, {len(lost)} lost")
+
+    errors = defaultdict(int)
+    for _, _, error in results:
+        if error is not None:
+            errors[str(error).splitlines()[0][:100]] += 1
+    if errors:
+        print("\nTop errors:")
+        for message, count in sorted(errors.items(), key=lambda item: -item[1])[:10]:
+            print(f"  {count:>5}  {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session load test for app.py against a fake Google Sheets backend.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--actions", type=int, default=20, help="Actions per session after login")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Median latency of a Sheets API call")
+    parser.add_argument("--quota-per-minute", type=int, default=300, help="Sheets requests allowed per rolling minute")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Probability of a random quota error per call")
+    parser.add_argument("--seed-orders", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds per script run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend = Backend(args.latency_ms, args.quota_per_minute, args.error_rate, args.seed)
+    spreadsheet = seed_spreadsheet(backend, args.sessions, args.seed_orders, args.seed)
+
+    # 🔑 Atrapa zamiast prawdziwego klienta
+    storage.connect_to_gsheets = lambda credentials: FakeClient(spreadsheet)
+    st.cache_resource.clear()
+
+    results = []
+    sessions = [Session(number, args, results) for number in range(args.sessions)]
+    threads = [threading.Thread(target=session.run) for session in sessions]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    report(results, sessions, backend, spreadsheet, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
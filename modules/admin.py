@@ -1,52 +1,79 @@
 import streamlit as st
 import pandas as pd
 import datetime
+from modules.order_lookup import paginate
+from modules.storage import SEAL_TYPES
 
-def show_admin_panel(users_df, save_data_to_gsheets, df, current_tab):
-    if current_tab == "Home":  # ✅ Edycja zleceń tylko na Home!
-        st.sidebar.header("✏️ Edit or Delete Orders")
-
-        if not df.empty:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            
-            selected_index = st.sidebar.selectbox("Select Order to Edit", df.index, key="admin_edit_selectbox")
-            
-            if selected_index is not None:
-                selected_row = df.loc[selected_index]
-                
-                with st.form(key=f"edit_order_form_{selected_index}"):
-                    selected_date = pd.to_datetime(selected_row['Date'], errors='coerce')
-                    date_value = selected_date.date() if isinstance(selected_date, pd.Timestamp) else datetime.date.today()
-
-                    date = st.date_input("Edit Production Date", value=date_value)
-                    company = st.text_input("Edit Company Name", value=selected_row['Company'])
-                    operator = st.text_input("Edit Operator", value=selected_row['Operator'])
-                    seal_type = st.selectbox(
-                        "Edit Seal Type", 
-                        ['Standard Soft', 'Standard Hard', 'Custom Soft', 'Custom Hard', 'V-Rings', 'Special'], 
-                        index=['Standard Soft', 'Standard Hard', 'Custom Soft', 'Custom Hard', 'V-Rings', 'Special'].index(selected_row['Seal Type'])
-                    )
-                    seals_count = st.number_input("Edit Number of Seals", min_value=0, value=int(selected_row['Seal Count']))
-                    production_time = st.number_input("Edit Production Time (Minutes)", min_value=0.0, value=float(selected_row['Production Time']))
-                    downtime = st.number_input("Edit Downtime (Minutes)", min_value=0.0, value=float(selected_row['Downtime']))
-                    downtime_reason = st.text_input("Edit Reason for Downtime", value=selected_row['Reason for Downtime'])
-
-                    update_button = st.form_submit_button("Update Order")
-                    delete_button = st.form_submit_button("Delete Order")
-
-                    if update_button:
-                        df.at[selected_index, 'Date'] = date
-                        df.at[selected_index, 'Company'] = company
-                        df.at[selected_index, 'Operator'] = operator
-                        df.at[selected_index, 'Seal Type'] = seal_type
-                        df.at[selected_index, 'Seal Count'] = seals_count
-                        df.at[selected_index, 'Production Time'] = production_time
-                        df.at[selected_index, 'Downtime'] = downtime
-                        df.at[selected_index, 'Reason for Downtime'] = downtime_reason
-                        save_data_to_gsheets(df)
-                        st.sidebar.success("✅ Order updated successfully!")
-
-                    if delete_button:
-                        df = df.drop(selected_index)
-                        save_data_to_gsheets(df)
-                        st.sidebar.success("✅ Order deleted successfully!")
+def show_admin_panel(df, order_index, update_order, delete_order):
+    st.subheader("✏️ Edit or Delete Orders")
+
+    if df.empty:
+        st.write("No orders to edit.")
+        return
+
+    # 🔍 Wyszukiwanie po indeksie (prefiks / podobne nazwy) zamiast listy wszystkich zleceń
+    col1, col2, col3 = st.columns(3)
+    company_query = col1.text_input("Company starts with", key="admin_company_query")
+    operator_query = col2.text_input("Operator starts with", key="admin_operator_query")
+    date_range = col3.date_input("Date Range", value=(), key="admin_date_range")
+    fuzzy = st.checkbox("Include similar names", key="admin_fuzzy")
+
+    date_from = date_range[0] if len(date_range) > 0 else None
+    date_to = date_range[1] if len(date_range) > 1 else None
+    positions = order_index.search(company_query, operator_query, date_from, date_to, fuzzy)
+
+    if len(positions) == 0:
+        st.write("No orders match the search.")
+        return
+
+    page = st.number_input("Page", min_value=1, value=1, step=1, key="admin_page")
+    page_positions, pages = paginate(positions, page)
+    st.caption(f"{len(positions)} orders found · page {min(page, pages)} of {pages}")
+
+    page_df = df.iloc[page_positions]
+    st.dataframe(page_df, hide_index=True)
+
+    selected_id = st.selectbox("Select Order to Edit", page_df['Order ID'], key="admin_edit_selectbox")
+    if selected_id is None:
+        return
+
+    selected_row = df.iloc[order_index.position(selected_id)]
+
+    with st.form(key=f"edit_order_form_{selected_id}"):
+        selected_date = pd.to_datetime(selected_row['Date'], errors='coerce')
+        date_value = selected_date.date() if isinstance(selected_date, pd.Timestamp) else datetime.date.today()
+
+        date = st.date_input("Edit Production Date", value=date_value)
+        company = st.text_input("Edit Company Name", value=selected_row['Company'])
+        operator = st.text_input("Edit Operator", value=selected_row['Operator'])
+        seal_type = st.selectbox(
+            "Edit Seal Type",
+            SEAL_TYPES,
+            index=SEAL_TYPES.index(selected_row['Seal Type']) if selected_row['Seal Type'] in SEAL_TYPES else 0
+        )
+        seals_count = st.number_input("Edit Number of Seals", min_value=0, value=int(selected_row['Seal Count']))
+        production_time = st.number_input("Edit Production Time (Minutes)", min_value=0.0, value=float(selected_row['Production Time']))
+        downtime = st.number_input("Edit Downtime (Minutes)", min_value=0.0, value=float(selected_row['Downtime']))
+        downtime_reason = st.text_input("Edit Reason for Downtime", value=selected_row['Reason for Downtime'])
+
+        update_button = st.form_submit_button("Update Order")
+        delete_button = st.form_submit_button("Delete Order")
+
+        if update_button:
+            values = selected_row.to_dict()
+            values.update({
+                'Date': date,
+                'Company': company,
+                'Operator': operator,
+                'Seal Type': seal_type,
+                'Seal Count': seals_count,
+                'Production Time': production_time,
+                'Downtime': downtime,
+                'Reason for Downtime': downtime_reason,
+            })
+            if update_order(selected_id, values):
+                st.success("✅ Order updated successfully!")
+
+        if delete_button:
+            if delete_order(selected_id):
+                st.success("✅ Order deleted successfully!")
@@ -10,6 +10,13 @@ def format_time(seconds):
         remaining_seconds = int(seconds % 60)
         return f"{minutes} minute{'s' if minutes > 1 else ''} {remaining_seconds} seconds"
 
+def average_time_table(df, column):
+    totals = df.groupby(column, sort=False)[['Production Time', 'Seal Count']].sum()
+    seals = totals['Seal Count'].where(totals['Seal Count'] > 0)
+    seconds = totals['Production Time'] / seals * 60  # 🔥 Konwersja na sekundy
+    upm = (60 / seconds.where(seconds > 0)).fillna(0).where(seals.notna())
+    return pd.DataFrame({column: totals.index, 'Seconds per Seal': seconds.values, 'UPM': upm.values})
+
 def calculate_average_time(df):
     st.header("⏳ Average Production Time Analysis")
 
@@ -21,8 +28,8 @@ def calculate_average_time(df):
         st.write("Date column not found in data.")
         return
 
-    # Konwersja kolumny 'Date' do formatu datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Konwersja kolumny 'Date' do formatu datetime (bez modyfikacji współdzielonych danych)
+    dates = pd.to_datetime(df['Date'])
 
     # 📅 Opcje wyboru przedziału czasowego
     st.sidebar.header("📅 Filter by Date Range")
@@ -45,7 +52,7 @@ def calculate_average_time(df):
         end_date = st.sidebar.date_input("End Date", value=datetime.now())
     
     # Filtrujemy dane na podstawie wybranego przedziału czasowego
-    filtered_df = df[(df['Date'] >= pd.to_datetime(start_date)) & (df['Date'] <= pd.to_datetime(end_date))]
+    filtered_df = df[(dates >= pd.to_datetime(start_date)) & (dates <= pd.to_datetime(end_date))]
 
     if filtered_df.empty:
         st.write("No data available for the selected date range.")
@@ -65,71 +72,12 @@ def calculate_average_time(df):
         unsafe_allow_html=True
     )
 
-    # Analiza na podstawie typu uszczelki
-    seal_types = filtered_df['Seal Type'].unique()
-    average_times = {}
-
-    for seal_type in seal_types:
-        filtered_type_df = filtered_df[filtered_df['Seal Type'] == seal_type]
-        total_time = filtered_type_df['Production Time'].sum()
-        total_seals = filtered_type_df['Seal Count'].sum()
-
-        if total_seals > 0:
-            avg_time = (total_time / total_seals) * 60  # 🔥 Konwersja na sekundy
-            seals_per_minute = 60 / avg_time if avg_time > 0 else 0
-            average_times[seal_type] = (format_time(avg_time), seals_per_minute)
-        else:
-            average_times[seal_type] = (None, None)
-
-    st.subheader("📊 By Seal Type")
-    result_df = pd.DataFrame(
-        [(seal_type, avg[0], avg[1]) for seal_type, avg in average_times.items()],
-        columns=['Seal Type', 'Average Time per Seal', 'Seals Produced per Minute (UPM)']
-    )
-    st.table(result_df)
-
-    # Analiza na podstawie firmy
-    companies = filtered_df['Company'].unique()
-    company_times = {}
-
-    for company in companies:
-        filtered_company_df = filtered_df[filtered_df['Company'] == company]
-        total_time = filtered_company_df['Production Time'].sum()
-        total_seals = filtered_company_df['Seal Count'].sum()
-
-        if total_seals > 0:
-            avg_time = (total_time / total_seals) * 60  # 🔥 Konwersja na sekundy
-            seals_per_minute = 60 / avg_time if avg_time > 0 else 0
-            company_times[company] = (format_time(avg_time), seals_per_minute)
-        else:
-            company_times[company] = (None, None)
-
-    st.subheader("📊 By Company")
-    company_df = pd.DataFrame(
-        [(company, avg[0], avg[1]) for company, avg in company_times.items()],
-        columns=['Company', 'Average Time per Seal', 'Seals Produced per Minute (UPM)']
-    )
-    st.table(company_df)
-
-    # Analiza na podstawie operatora
-    operators = filtered_df['Operator'].unique()
-    operator_times = {}
-
-    for operator in operators:
-        filtered_operator_df = filtered_df[filtered_df['Operator'] == operator]
-        total_time = filtered_operator_df['Production Time'].sum()
-        total_seals = filtered_operator_df['Seal Count'].sum()
-
-        if total_seals > 0:
-            avg_time = (total_time / total_seals) * 60  # 🔥 Konwersja na sekundy
-            seals_per_minute = 60 / avg_time if avg_time > 0 else 0
-            operator_times[operator] = (format_time(avg_time), seals_per_minute)
-        else:
-            operator_times[operator] = (None, None)
-
-    st.subheader("📊 By Operator")
-    operator_df = pd.DataFrame(
-        [(operator, avg[0], avg[1]) for operator, avg in operator_times.items()],
-        columns=['Operator', 'Average Time per Seal', 'Seals Produced per Minute (UPM)']
-    )
-    st.table(operator_df)
+    # Analiza na podstawie typu uszczelki, firmy i operatora
+    for column, title in [('Seal Type', "📊 By Seal Type"), ('Company', "📊 By Company"), ('Operator', "📊 By Operator")]:
+        averages = average_time_table(filtered_df, column)
+        st.subheader(title)
+        st.table(pd.DataFrame({
+            column: averages[column],
+            'Average Time per Seal': [format_time(seconds) if pd.notna(seconds) else None for seconds in averages['Seconds per Seal']],
+            'Seals Produced per Minute (UPM)': averages['UPM'],
+        }))
@@ -0,0 +1,161 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from modules.storage import ORDER_COLUMNS, SEAL_TYPES, new_order_ids
+
+PROFILE_SEAL_TYPES = ['Standard Hard', 'Standard Soft']
+DEDUP_COLUMNS = ['Date', 'Company', 'Operator', 'Seal Type', 'Seal Count', 'Production Time']
+STACK_COUNT_COLUMN = 'Actual Seal Count'
+
+
+def read_import_file(uploaded_file):
+    if uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(uploaded_file)
+    return pd.read_csv(uploaded_file)
+
+
+def _text(raw, column):
+    if column not in raw.columns:
+        return pd.Series("", index=raw.index)
+    return raw[column].fillna("").astype(str).str.strip()
+
+
+def _number(raw, column):
+    if column not in raw.columns:
+        return pd.Series(np.nan, index=raw.index)
+    return pd.to_numeric(raw[column], errors='coerce')
+
+
+def validate_orders(raw, default_operator=""):
+    # 🔍 Te same zasady co w formularzu, ale dla całego pliku naraz
+    orders = pd.DataFrame(index=raw.index)
+    # 📅 format='mixed' - eksporty z MES mieszają formaty, format z pierwszego wiersza odrzucałby poprawne daty
+    orders['Date'] = pd.to_datetime(raw['Date'] if 'Date' in raw.columns else pd.Series(pd.NaT, index=raw.index), format='mixed', errors='coerce').dt.date
+    orders['Company'] = _text(raw, 'Company')
+    orders['Operator'] = _text(raw, 'Operator').replace("", default_operator)
+    orders['Seal Type'] = _text(raw, 'Seal Type')
+
+    # 📋 Stack: liczba uszczelek ze stosu ma pierwszeństwo (jak w formularzu)
+    seal_count = _number(raw, 'Seal Count')
+    stack_count = _number(raw, STACK_COUNT_COLUMN)
+    use_stack_count = (orders['Seal Type'] == 'Stack') & (stack_count > 0)
+    orders['Seal Count'] = seal_count.where(~use_stack_count, stack_count)
+
+    profile = _text(raw, 'Profile')
+    orders['Profile'] = profile.where(orders['Seal Type'].isin(PROFILE_SEAL_TYPES) & (profile != ""), "N/A")
+    orders['Production Time'] = _number(raw, 'Production Time').fillna(0.0)
+    orders['Downtime'] = _number(raw, 'Downtime').fillna(0.0)
+    orders['Reason for Downtime'] = _text(raw, 'Reason for Downtime').replace("", "N/A")
+
+    # 🔑 Walidacja - pierwsza napotkana przyczyna odrzucenia dla każdego wiersza
+    reasons = pd.Series("", index=raw.index)
+    checks = [
+        (orders['Date'].isna(), "Invalid date"),
+        (orders['Company'] == "", "Company name is required"),
+        (~orders['Seal Type'].isin(SEAL_TYPES), "Unknown seal type"),
+        (~(orders['Seal Count'] > 0), "The number of seals must be greater than zero"),
+        (orders['Seal Count'] % 1 != 0, "The number of seals must be a whole number"),
+        ((orders['Production Time'] < 0) | (orders['Downtime'] < 0), "Negative time"),
+    ]
+    for failed, message in checks:
+        reasons = reasons.mask(failed & (reasons == ""), message)
+
+    valid = reasons == ""
+    accepted = orders[valid].copy()
+    accepted['Seal Count'] = accepted['Seal Count'].astype(int)
+    accepted['Order ID'] = new_order_ids(len(accepted))
+
+    rejected = raw[~valid].copy()
+    rejected['Rejection Reason'] = reasons[~valid]
+    return accepted[ORDER_COLUMNS], rejected
+
+
+def order_hashes(orders):
+    key = pd.DataFrame({
+        'Date': pd.to_datetime(orders['Date'], errors='coerce').dt.strftime('%Y-%m-%d'),
+        'Company': orders['Company'].astype(str).str.strip().str.lower(),
+        'Operator': orders['Operator'].astype(str).str.strip().str.lower(),
+        'Seal Type': orders['Seal Type'].astype(str).str.strip(),
+        # ✅ float64 - hash_pandas_object haszuje int64 i float64 inaczej (plik z liczbami całkowitymi vs arkusz)
+        'Seal Count': pd.to_numeric(orders['Seal Count'], errors='coerce').astype('float64').round(0),
+        'Production Time': pd.to_numeric(orders['Production Time'], errors='coerce').astype('float64').round(2),
+    })
+    return pd.util.hash_pandas_object(key[DEDUP_COLUMNS], index=False)
+
+
+def existing_hashes(existing_df):
+    return set(order_hashes(existing_df)) if not existing_df.empty else set()
+
+
+class OrderHashes:
+    # 🔑 Hasze istniejących zleceń - budowane raz na wersję danych (jak indeksy w app.py), nie przy każdym przebiegu
+    def __init__(self, hashes=None):
+        self.hashes = hashes if hashes is not None else set()
+
+    @classmethod
+    def from_dataframe(cls, df):
+        return cls(existing_hashes(df))
+
+    def updated(self, entries):
+        # Kopia zbioru liczb całkowitych (operacja w C) + hasze tylko nowych zleceń
+        return OrderHashes(self.hashes | set(order_hashes(pd.DataFrame(entries))))
+
+    def __contains__(self, value):
+        return value in self.hashes
+
+
+def split_new_orders(accepted, known_hashes):
+    # 🔥 Zbiór haszy istniejących zleceń - sprawdzenie duplikatu w O(1) na wiersz, bez haszowania historii
+    new_hashes = order_hashes(accepted)
+    known = pd.Series([value in known_hashes for value in new_hashes], index=accepted.index, dtype=bool)
+    duplicate = known | new_hashes.duplicated()
+    return accepted[~duplicate], accepted[duplicate], set(new_hashes[~duplicate])
+
+
+def show_bulk_import(df, known_hashes, append_rows_to_gsheets):
+    st.header("📥 Bulk Import")
+    st.write("Upload a CSV or XLSX export with columns: " + ", ".join(ORDER_COLUMNS[:-1]) + f" (optional: {STACK_COUNT_COLUMN}).")
+
+    uploaded_file = st.file_uploader("Upload Orders File", type=["csv", "xlsx"], key="bulk_import_file")
+    if uploaded_file is None:
+        return df
+
+    try:
+        raw = read_import_file(uploaded_file)
+    except Exception as e:
+        st.error(f"❌ Error reading file: {e}")
+        return df
+
+    default_operator = st.session_state.user['Username'] if st.session_state.get('user') is not None else ""
+    accepted, rejected = validate_orders(raw, default_operator)
+    new_orders, duplicates, _ = split_new_orders(accepted, known_hashes)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("New Orders", len(new_orders))
+    col2.metric("Duplicates", len(duplicates))
+    col3.metric("Rejected", len(rejected))
+
+    if not rejected.empty:
+        st.subheader("⚠️ Rejected Rows")
+        st.dataframe(rejected)
+        st.download_button(
+            label="Download Rejected Rows",
+            data=rejected.to_csv(index=False).encode('utf-8'),
+            file_name="rejected_orders.csv",
+            mime="text/csv"
+        )
+
+    if new_orders.empty:
+        st.info("Nothing new to import.")
+        return df
+
+    if st.button(f"Import {len(new_orders)} Orders"):
+        try:
+            append_rows_to_gsheets(new_orders)
+        except Exception as e:
+            st.error(f"❌ Error importing orders: {e}")
+            return df
+        st.success(f"✅ Imported {len(new_orders)} orders successfully!")
+        df = pd.concat([df, new_orders], ignore_index=True)
+
+    return df
@@ -1,39 +1,31 @@
 import streamlit as st
 import pandas as pd
 import datetime
+from modules.capacity import work_day_minutes
+from modules.simulation import per_seal_time_samples, simulate_completion, completion_percentile, completion_probability
 
 def add_work_minutes(start_datetime, work_minutes, seal_type, max_days=365):
-    total_minutes = 0
+    # None, jeśli praca nie mieści się w max_days (komunikat po stronie wywołującego - UI lub API)
     days_processed = 0
 
     while work_minutes > 0:
         if days_processed > max_days:
-            st.error("⚠️ Maximum day limit (365) exceeded. Check your input data.")
             return None
 
         weekday = start_datetime.weekday()
-        
-        if weekday < 4:  # Poniedziałek - Czwartek
-            if seal_type in ['Standard Hard', 'Standard Soft'] and weekday in [0, 1, 2]:  # Praktykant też pracuje
-                work_day_minutes = 960  # Ty + Praktykant = 510 + 450 = 960 minut
-            else:
-                work_day_minutes = 510  # Tylko Ty + pracownik
-        elif weekday == 4:  # Piątek - tylko praktykant
-            if seal_type in ['Standard Hard', 'Standard Soft']:
-                work_day_minutes = 450  # Praktykant tylko
-            else:
-                work_day_minutes = 0  # Brak możliwości pracy nad innymi zleceniami w piątek
-        else:  # Sobota, Niedziela - nikt nie pracuje
+
+        if weekday >= 5:  # Sobota, Niedziela - nikt nie pracuje
             start_datetime += datetime.timedelta(days=1)
             days_processed += 1
             continue
 
-        if work_minutes <= work_day_minutes:
-            total_minutes += work_minutes
-            return start_datetime + datetime.timedelta(minutes=total_minutes)
+        day_minutes = work_day_minutes(weekday, seal_type)
+
+        if work_minutes <= day_minutes:
+            # ✅ Ta sama godzina startu co w symulacji: dzień roboczy + pozostałe minuty
+            return start_datetime + datetime.timedelta(minutes=work_minutes)
         else:
-            work_minutes -= work_day_minutes
-            total_minutes += work_day_minutes
+            work_minutes -= day_minutes
             start_datetime += datetime.timedelta(days=1)
             days_processed += 1
 
@@ -49,7 +41,7 @@ def format_time(minutes):
         remaining_minutes = int(minutes % 60)
         return f"{hours}h {remaining_minutes}m" if remaining_minutes > 0 else f"{hours}h"
 
-def show_calculator(df):
+def show_calculator(df, model):
     st.header("📅 Production Calculator")
 
     if 'orders' not in st.session_state:
@@ -66,17 +58,19 @@ def show_calculator(df):
     selected_seal_type = st.selectbox("Select Seal Type", seal_types)
     order_quantity = st.number_input("Order Quantity", min_value=1, step=1)
 
-    filtered_df = df[(df['Seal Type'] == selected_seal_type) & (df['Company'] == selected_company)]
-
-    if not filtered_df.empty:
-        total_production_time = filtered_df['Production Time'].sum()
-        total_seals = filtered_df['Seal Count'].sum()
-
-        if total_seals > 0:
-            average_time_per_seal = total_production_time / total_seals
-            st.success(f"📈 Average Time per Seal: {format_time(average_time_per_seal)}")
-        else:
-            average_time_per_seal = 0
+    # 📈 Model wydajności (średnia wykładnicza + okno kroczące) zamiast pełnego przeszukiwania historii
+    operators = model.operators(selected_company, selected_seal_type)
+    selected_operator = st.selectbox("Operator", ["All Operators"] + operators, format_func=str)
+    stats = model.get(selected_company, selected_seal_type, None if selected_operator == "All Operators" else selected_operator)
+
+    if stats is not None and stats.ewma_upm > 0:
+        average_time_per_seal = 1 / stats.ewma_upm
+        st.success(f"📈 Average Time per Seal (recent): {format_time(average_time_per_seal)}")
+        if stats.rolling_upm > 0:
+            st.caption(
+                f"Last {len(stats.window)} orders: {format_time(1 / stats.rolling_upm)} per seal "
+                f"({stats.rolling_upm:.2f} UPM) · {stats.orders} orders in history"
+            )
     else:
         average_time_per_seal = 0
 
@@ -126,4 +120,22 @@ def show_calculator(df):
             else:
                 st.error("⛔ It is not possible to complete all orders within the specified time range.")
         else:
-            st.error("⚠️ Calculation failed. Check your input data.")
+            st.error("⚠️ Maximum day limit (365) exceeded. Check your input data.")
+
+        # 🎲 Symulacja Monte Carlo - przedziały ufności dla terminu zakończenia
+        st.subheader("🎲 Completion Confidence (Monte Carlo)")
+        if st.checkbox("Run simulation", key="calculator_simulation"):
+            n_scenarios = st.select_slider("Scenarios", options=[1000, 10000, 50000, 100000], value=10000)
+            samples = per_seal_time_samples(df)
+            completion_minutes = simulate_completion(
+                st.session_state.orders, samples, start_datetime, selected_seal_type, n_scenarios=n_scenarios
+            )
+
+            p50 = completion_percentile(completion_minutes, start_datetime, 0.5)
+            p90 = completion_percentile(completion_minutes, start_datetime, 0.9)
+            on_time = completion_probability(completion_minutes, start_datetime, end_datetime)
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("P50 Completion", p50.strftime('%Y-%m-%d %H:%M') if p50 else "> 365 days")
+            col2.metric("P90 Completion", p90.strftime('%Y-%m-%d %H:%M') if p90 else "> 365 days")
+            col3.metric("Chance to Finish in Range", f"{on_time:.0%}")
@@ -0,0 +1,22 @@
+import numpy as np
+
+STANDARD_SEAL_TYPES = ['Standard Hard', 'Standard Soft']
+
+
+def work_day_minutes(weekday, seal_type):
+    if weekday < 4:  # Poniedziałek - Czwartek
+        if seal_type in STANDARD_SEAL_TYPES and weekday in [0, 1, 2]:  # Praktykant też pracuje
+            return 960  # Ty + Praktykant = 510 + 450 = 960 minut
+        return 510  # Tylko Ty + pracownik
+    if weekday == 4:  # Piątek - tylko praktykant
+        if seal_type in STANDARD_SEAL_TYPES:
+            return 450  # Praktykant tylko
+        return 0  # Brak możliwości pracy nad innymi zleceniami w piątek
+    return 0  # Sobota, Niedziela - nikt nie pracuje
+
+
+def capacity_calendar(start_date, seal_type, days):
+    # 📅 Dostępne minuty pracy na każdy dzień od daty startowej (tablica NumPy)
+    first_weekday = start_date.weekday()
+    weekly = np.array([work_day_minutes(day, seal_type) for day in range(7)], dtype=float)
+    return weekly[(first_weekday + np.arange(days)) % 7]
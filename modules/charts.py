@@ -6,8 +6,7 @@ def show_charts(df):
     st.header("📈 Production Charts")
 
     if not df.empty:
-        # ✅ Konwersja kolumny 'Date' do formatu datetime i wyciągnięcie tylko daty
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
+        # ✅ Kolumna 'Date' zawiera już same daty (storage) - współdzielonych danych nie modyfikujemy
 
         # 📅 Opcje filtrowania
         filter_option = st.selectbox(
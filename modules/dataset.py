@@ -0,0 +1,53 @@
+import time
+import threading
+from modules import sync
+from modules.sync import OrderSync
+
+# Jeden współdzielony zbiór danych na proces (st.cache_resource w app.py), zamiast kopii w każdej sesji.
+# Każda wersja to osobny DatasetSnapshot - po opublikowaniu ani ramka, ani obiekty z niej wyliczone nie są zmieniane.
+
+
+class DatasetSnapshot:
+    def __init__(self, version, frame, derived=None):
+        self.version = version
+        self.frame = frame
+        self.derived = derived if derived is not None else {}  # Nazwa -> obiekt wyliczony z tej ramki
+
+
+class SharedDataset:
+    def __init__(self, spreadsheet):
+        self.lock = threading.Lock()
+        self.sync = OrderSync(spreadsheet)
+        self.current = DatasetSnapshot(0, self.sync.frame)
+        self.last_poll = time.monotonic()
+
+    def snapshot(self):
+        # 🔑 Sesja czyta ramkę i statystyki z tej samej wersji przez cały przebieg skryptu
+        return self.current
+
+    def refresh(self, force=False, appended=0):
+        # 🔄 Sprawdzanie rewizji raz na POLL_INTERVAL dla całego procesu, a nie dla każdej sesji
+        with self.lock:
+            if not force and time.monotonic() - self.last_poll < sync.POLL_INTERVAL:
+                return self.current.version
+
+            self.last_poll = time.monotonic()  # Także po błędzie API - bez ponawiania przez każdą sesję
+            status, new_orders = self.sync.poll(force, appended)
+
+            if status == sync.DELTA:
+                # 🔥 updated() zwraca nową wersję obiektu, współdzieląc niezmienione części ze starą -
+                # sesje czytające poprzednią wersję nic nie widzą, koszt zależy od liczby nowych zleceń
+                entries = new_orders.to_dict('records')
+                derived = {name: value.updated(entries) for name, value in self.current.derived.items()}
+                self.current = DatasetSnapshot(self.current.version + 1, self.sync.frame, derived)
+            elif status == sync.RELOAD:
+                self.current = DatasetSnapshot(self.current.version + 1, self.sync.frame)
+            return self.current.version
+
+    def get_derived(self, snapshot, name, build):
+        # 📦 Obiekty wyliczane z danych (np. model wydajności) - budowane raz na wersję
+        with self.lock:
+            value = snapshot.derived.get(name)
+            if value is None:
+                value = snapshot.derived[name] = build(snapshot.frame)
+            return value
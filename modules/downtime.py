@@ -0,0 +1,174 @@
+import re
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from functools import lru_cache
+
+UNSPECIFIED_REASON = "Unspecified"
+EMPTY_REASONS = {"", "n/a", "na", "none", "brak", "-", "nan"}
+
+# 🔑 Synonimy wpisywane ręcznie w formularzu -> jedna nazwa przyczyny
+REASON_ALIASES = {
+    "tool change": "Tool Change",
+    "tooling change": "Tool Change",
+    "wymiana narzędzia": "Tool Change",
+    "setup": "Setup / Changeover",
+    "set up": "Setup / Changeover",
+    "changeover": "Setup / Changeover",
+    "przezbrojenie": "Setup / Changeover",
+    "breakdown": "Machine Breakdown",
+    "machine failure": "Machine Breakdown",
+    "machine breakdown": "Machine Breakdown",
+    "awaria": "Machine Breakdown",
+    "no material": "Material Shortage",
+    "material shortage": "Material Shortage",
+    "brak materiału": "Material Shortage",
+    "break": "Break",
+    "przerwa": "Break",
+}
+
+
+@lru_cache(maxsize=None)
+def canonicalize_reason(reason):
+    text = re.sub(r"[^\w\s/]", " ", str(reason).lower())
+    text = re.sub(r"\s+", " ", text).strip()
+    if text in EMPTY_REASONS:
+        return UNSPECIFIED_REASON
+    return REASON_ALIASES.get(text, text.capitalize())
+
+
+def week_start(date):
+    date = pd.Timestamp(date)
+    return (date - pd.Timedelta(days=date.dayofweek)).date()
+
+
+class DowntimeAggregates:
+    DIMENSIONS = ('Operator', 'Seal Type', 'Week')
+
+    def __init__(self):
+        self.by_reason = {}
+        self.by_dimension = {dimension: {} for dimension in self.DIMENSIONS}
+        self.total_downtime = 0.0
+        self.total_production = 0.0
+        self.order_count = 0
+
+    @classmethod
+    def from_dataframe(cls, df):
+        aggregates = cls()
+        aggregates.order_count = len(df)
+        if df.empty:
+            return aggregates
+
+        dates = pd.to_datetime(df['Date'], errors='coerce')
+        # ✅ Kanonizacja tylko dla unikalnych wartości, nie dla każdego wiersza
+        codes, uniques = pd.factorize(df['Reason for Downtime'])
+        canonical = np.array([canonicalize_reason(reason) for reason in uniques] + [UNSPECIFIED_REASON], dtype=object)  # -1 = brak wartości
+
+        frame = pd.DataFrame({
+            'Reason': canonical[codes],
+            'Operator': df['Operator'],
+            'Seal Type': df['Seal Type'],
+            'Week': (dates - pd.to_timedelta(dates.dt.dayofweek, unit='D')).dt.date,
+            'Downtime': pd.to_numeric(df['Downtime'], errors='coerce').fillna(0),
+            'Production Time': pd.to_numeric(df['Production Time'], errors='coerce').fillna(0),
+        }).dropna(subset=['Week'])
+
+        # 🔥 Jedno grupowanie po wszystkich wymiarach, reszta to sumy z wyniku
+        grouped = frame.groupby(['Reason', 'Operator', 'Seal Type', 'Week'], sort=False, dropna=False)[['Downtime', 'Production Time']].sum()
+        for (reason, operator, seal_type, week), (downtime, production) in zip(grouped.index, grouped.to_numpy()):
+            aggregates._add(reason, {'Operator': operator, 'Seal Type': seal_type, 'Week': week}, downtime, production)
+
+        return aggregates
+
+    def _add(self, reason, keys, downtime, production):
+        if downtime > 0:
+            self.by_reason[reason] = self.by_reason.get(reason, 0.0) + downtime
+        for dimension, key in keys.items():
+            # ✅ Nowa lista zamiast zmiany w miejscu - poprzednie wersje agregatów współdzielą stare listy
+            downtime_total, production_total = self.by_dimension[dimension].get(key, (0.0, 0.0))
+            self.by_dimension[dimension][key] = [downtime_total + downtime, production_total + production]
+        self.total_downtime += downtime
+        self.total_production += production
+
+    def updated(self, entries):
+        # 🔥 Nowa wersja: płytkie kopie małych słowników (przyczyny, operatorzy, typy, tygodnie)
+        aggregates = DowntimeAggregates()
+        aggregates.by_reason = dict(self.by_reason)
+        aggregates.by_dimension = {dimension: dict(totals) for dimension, totals in self.by_dimension.items()}
+        aggregates.total_downtime = self.total_downtime
+        aggregates.total_production = self.total_production
+        aggregates.order_count = self.order_count
+        for entry in entries:
+            downtime = pd.to_numeric(entry['Downtime'], errors='coerce')
+            production = pd.to_numeric(entry['Production Time'], errors='coerce')
+            date = pd.to_datetime(entry['Date'], errors='coerce')
+            if not pd.isna(date):
+                aggregates._add(
+                    canonicalize_reason(entry['Reason for Downtime']),
+                    {'Operator': entry['Operator'], 'Seal Type': entry['Seal Type'], 'Week': week_start(date)},
+                    0.0 if pd.isna(downtime) else float(downtime),
+                    0.0 if pd.isna(production) else float(production),
+                )
+            aggregates.order_count += 1
+        return aggregates
+
+    @property
+    def availability(self):
+        planned = self.total_production + self.total_downtime
+        return self.total_production / planned if planned > 0 else None
+
+    def pareto(self):
+        pareto_df = pd.Series(self.by_reason, dtype=float).sort_values(ascending=False).rename_axis('Reason').reset_index(name='Downtime')
+        total = pareto_df['Downtime'].sum()
+        pareto_df['Cumulative %'] = pareto_df['Downtime'].cumsum() / total * 100 if total > 0 else 0.0
+        return pareto_df
+
+    def table(self, dimension):
+        rows = [(key, downtime, production) for key, (downtime, production) in self.by_dimension[dimension].items()]
+        table_df = pd.DataFrame(rows, columns=[dimension, 'Downtime (min)', 'Production Time (min)'])
+        planned = table_df['Downtime (min)'] + table_df['Production Time (min)']
+        table_df['Availability %'] = (table_df['Production Time (min)'] / planned.where(planned > 0) * 100).round(1)
+        return table_df.sort_values(dimension if dimension == 'Week' else 'Downtime (min)', ascending=dimension == 'Week')
+
+
+def show_downtime(df, aggregates):
+    st.header("⏱️ Downtime Analysis")
+
+    if df.empty:
+        st.write("No data available to analyse downtime.")
+        return
+
+    col1, col2 = st.columns(2)
+    col1.metric("Total Downtime", f"{aggregates.total_downtime:.0f} min")
+    availability = aggregates.availability
+    col2.metric("Availability", f"{availability:.1%}" if availability is not None else "N/A")
+
+    pareto_df = aggregates.pareto()
+    if pareto_df.empty:
+        st.write("No downtime recorded.")
+        return
+
+    # 📊 Wykres Pareto - przyczyny przestojów + skumulowany udział
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=pareto_df['Reason'], y=pareto_df['Downtime'], name='Downtime (min)'))
+    fig.add_trace(go.Scatter(
+        x=pareto_df['Reason'], y=pareto_df['Cumulative %'], name='Cumulative %',
+        yaxis='y2', mode='lines+markers'
+    ))
+    fig.update_layout(
+        title='Downtime Pareto by Reason',
+        xaxis_title="Reason",
+        yaxis=dict(title="Downtime (min)"),
+        yaxis2=dict(title="Cumulative %", overlaying='y', side='right', range=[0, 105]),
+    )
+    st.plotly_chart(fig)
+
+    st.subheader("📊 By Operator")
+    st.dataframe(aggregates.table('Operator'), hide_index=True)
+
+    st.subheader("📊 By Seal Type")
+    st.dataframe(aggregates.table('Seal Type'), hide_index=True)
+
+    st.subheader("📊 By Week")
+    st.dataframe(aggregates.table('Week'), hide_index=True)
@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import datetime
+from modules.storage import SEAL_TYPES, new_order_ids
 
-def show_form(df, save_data_to_gsheets):
+def show_form(df, append_rows_to_gsheets):
     st.sidebar.header("➕ Add New Completed Order")
     
     # 🔥 Sprawdzenie, czy użytkownik jest zalogowany
@@ -26,7 +27,7 @@ def show_form(df, save_data_to_gsheets):
         operator = st.text_input("Operator", value=operator_name, disabled=True)  # Teraz pole jest wyświetlane, ale nie można go zmienić
         
         # 🪙 4. Wybór typu uszczelki
-        seal_type = st.selectbox("Seal Type", ['Standard Soft', 'Standard Hard', 'Custom Soft', 'Custom Hard', 'V-Rings', 'Stack'])
+        seal_type = st.selectbox("Seal Type", SEAL_TYPES)
 
         # 📋 Dodatkowe pola dla wybranych typów uszczelek
         profile = "N/A"
@@ -72,11 +73,14 @@ def show_form(df, save_data_to_gsheets):
                     'Seal Count': total_seals,
                     'Production Time': production_time,
                     'Downtime': downtime,
-                    'Reason for Downtime': downtime_reason if downtime_reason else "N/A"
+                    'Reason for Downtime': downtime_reason if downtime_reason else "N/A",
+                    'Order ID': new_order_ids(1)[0]
                 }
                 
-                df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
-                save_data_to_gsheets(df)
+                # ✅ Dopisujemy tylko nowy wiersz - bez przepisywania arkusza z (być może nieaktualnej) ramki
+                new_order = pd.DataFrame([new_entry])
+                append_rows_to_gsheets(new_order)
+                df = pd.concat([df, new_order], ignore_index=True)
                 st.sidebar.success("✅ Order saved successfully!")
 
     return df
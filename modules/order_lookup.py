@@ -0,0 +1,121 @@
+import copy
+import difflib
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 25
+REBUILD_THRESHOLD = 1000  # Po tylu dopisanych zleceniach indeksy sortowane są budowane od nowa
+TEXT_FIELDS = ('Company', 'Operator')
+
+
+class OrderIndex:
+    # Listy i słowniki są tylko dopisywane i współdzielone przez kolejne wersje indeksu;
+    # każda wersja widzi wyłącznie pozycje < order_count, więc starsze wersje się nie zmieniają.
+    def __init__(self):
+        self.ids = {}  # Order ID -> pozycja wiersza w ramce danych
+        self.values = {field: [] for field in TEXT_FIELDS}
+        self.by_value = {field: {} for field in TEXT_FIELDS}
+        self.dates = []
+        self.indexed = 0
+        self.order_count = 0
+        self._rebuild()
+
+    @classmethod
+    def from_dataframe(cls, df):
+        index = cls()
+        index.ids = {order_id: position for position, order_id in enumerate(df['Order ID'])}
+        for field in TEXT_FIELDS:
+            index.values[field] = df[field].astype(str).str.strip().str.lower().tolist()
+            for position, value in enumerate(index.values[field]):
+                index.by_value[field].setdefault(value, []).append(position)
+        index.dates = pd.to_datetime(df['Date'], errors='coerce').tolist()
+        index.order_count = len(df)
+        index._rebuild()
+        return index
+
+    def _rebuild(self):
+        # 🔑 Posortowane wartości + pozycje -> wyszukiwanie prefiksu przez bisekcję (np.searchsorted)
+        self.sorted_keys = {}
+        self.sorted_positions = {}
+        for field in TEXT_FIELDS:
+            keys = np.array(self.values[field][:self.order_count], dtype=object)
+            order = np.argsort(keys, kind='stable')
+            self.sorted_keys[field] = keys[order]
+            self.sorted_positions[field] = order
+        self.date_array = pd.to_datetime(pd.Series(self.dates[:self.order_count], dtype=object)).to_numpy(dtype='datetime64[ns]')
+        self.indexed = self.order_count
+
+    def _detach(self):
+        # Ta wersja ma już następcę, który dopisał do wspólnych list - kopia obcięta do własnej długości
+        count = self.order_count
+        self.ids = {order_id: position for order_id, position in self.ids.items() if position < count}
+        self.values = {field: values[:count] for field, values in self.values.items()}
+        self.by_value = {
+            field: {value: [position for position in positions if position < count] for value, positions in by_value.items()}
+            for field, by_value in self.by_value.items()
+        }
+        self.dates = self.dates[:count]
+
+    def updated(self, entries):
+        # 🔥 Nowa wersja w O(nowych zleceń): wspólne listy, nowe zlecenia na końcu; do czasu przebudowy szukane liniowo
+        index = copy.copy(self)
+        if index.order_count != len(index.dates):
+            index._detach()
+        for entry in entries:
+            position = index.order_count
+            index.ids[entry['Order ID']] = position
+            for field in TEXT_FIELDS:
+                value = str(entry[field]).strip().lower()
+                index.values[field].append(value)
+                index.by_value[field].setdefault(value, []).append(position)
+            index.dates.append(pd.to_datetime(entry['Date'], errors='coerce'))
+            index.order_count += 1
+        if index.order_count - index.indexed >= REBUILD_THRESHOLD:
+            index._rebuild()
+        return index
+
+    def position(self, order_id):
+        position = self.ids.get(order_id)
+        return position if position is not None and position < self.order_count else None
+
+    def _prefix_match(self, field, query):
+        keys = self.sorted_keys[field]
+        start = np.searchsorted(keys, query, side='left')
+        end = np.searchsorted(keys, query + '\uffff', side='left')
+        values = self.values[field]
+        pending = [position for position in range(self.indexed, self.order_count) if values[position].startswith(query)]
+        return np.concatenate([self.sorted_positions[field][start:end], np.array(pending, dtype=int)])
+
+    def _fuzzy_match(self, field, query):
+        matches = difflib.get_close_matches(query, list(self.by_value[field]), n=10, cutoff=0.6)
+        positions = [position for value in matches for position in self.by_value[field][value] if position < self.order_count]
+        return np.array(positions, dtype=int)
+
+    def search(self, company="", operator="", date_from=None, date_to=None, fuzzy=False):
+        positions = None
+        for field, query in (('Company', company), ('Operator', operator)):
+            query = query.strip().lower()
+            if not query:
+                continue
+            matched = self._prefix_match(field, query)
+            if fuzzy:
+                matched = np.union1d(matched, self._fuzzy_match(field, query))
+            positions = matched if positions is None else np.intersect1d(positions, matched)
+
+        if positions is None:
+            positions = np.arange(self.order_count)
+
+        dates = np.concatenate([self.date_array, np.array(self.dates[self.indexed:self.order_count], dtype='datetime64[ns]')])
+        if date_from is not None:
+            positions = positions[dates[positions] >= np.datetime64(pd.Timestamp(date_from))]
+        if date_to is not None:
+            positions = positions[dates[positions] <= np.datetime64(pd.Timestamp(date_to))]
+
+        # 📅 Najnowsze zlecenia na początku
+        return positions[np.lexsort((-positions, -dates[positions].astype('int64')))]
+
+
+def paginate(positions, page, page_size=PAGE_SIZE):
+    pages = max(1, -(-len(positions) // page_size))
+    page = min(max(page, 1), pages)
+    return positions[(page - 1) * page_size:page * page_size], pages
@@ -2,6 +2,9 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime, date
 
+def seal_rollup(df, column):
+    return df.groupby(column)['Seal Count'].sum().sort_values(ascending=False)
+
 def show_reports(df):
     st.header("📊 Reports")
 
@@ -9,12 +12,7 @@ def show_reports(df):
         st.write("No data available.")
         return
 
-    # ✅ Konwersja kolumny 'Date' do formatu datetime.date (tylko data, bez godzin)
-    try:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date  # 🔥 Usunięcie godziny, pozostaje tylko data
-    except Exception as e:
-        st.error(f"❌ Error converting dates: {e}")
-        return
+    # ✅ Kolumna 'Date' zawiera już same daty (storage) - współdzielonych danych nie modyfikujemy
 
     # 📅 Filtr daty - wybór przedziału czasowego
     start_date = st.sidebar.date_input("Start Date", value=(datetime.now().date() - pd.DateOffset(days=30)).date(), key="start_date")
@@ -31,16 +29,16 @@ def show_reports(df):
     report_df = df  # Zamiast `filtered_df`, używamy pełnego DataFrame `df`
 
     # 📊 Przykładowy raport - Suma uszczelek na firmę
-    seals_per_company = report_df.groupby('Company')['Seal Count'].sum().sort_values(ascending=False)
+    seals_per_company = seal_rollup(report_df, 'Company')
     st.subheader("Total Seals Produced by Company")
     st.bar_chart(seals_per_company)
 
     # 📊 Przykładowy raport - Suma uszczelek na operatora
-    seals_per_operator = report_df.groupby('Operator')['Seal Count'].sum().sort_values(ascending=False)
+    seals_per_operator = seal_rollup(report_df, 'Operator')
     st.subheader("Total Seals Produced by Operator")
     st.bar_chart(seals_per_operator)
 
     # 📊 Przykładowy raport - Suma uszczelek na typ uszczelki
-    seals_per_type = report_df.groupby('Seal Type')['Seal Count'].sum().sort_values(ascending=False)
+    seals_per_type = seal_rollup(report_df, 'Seal Type')
     st.subheader("Total Seals Produced by Seal Type")
     st.bar_chart(seals_per_type)
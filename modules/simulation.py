@@ -0,0 +1,63 @@
+import datetime
+import numpy as np
+import pandas as pd
+from modules.capacity import capacity_calendar
+
+DEFAULT_SCENARIOS = 10000
+
+
+def per_seal_time_samples(df):
+    # 📊 Historyczne czasy na uszczelkę (minuty) dla każdej pary (firma, typ uszczelki)
+    seals = pd.to_numeric(df['Seal Count'], errors='coerce')
+    minutes = pd.to_numeric(df['Production Time'], errors='coerce')
+    valid = (seals > 0) & (minutes > 0)
+
+    rates = minutes[valid] / seals[valid]
+    groups = rates.groupby([df.loc[valid, 'Company'], df.loc[valid, 'Seal Type']])
+    return {key: values.to_numpy(dtype=float) for key, values in groups}
+
+
+def simulate_completion(orders, samples, start_datetime, seal_type, n_scenarios=DEFAULT_SCENARIOS, max_days=365, seed=None):
+    rng = np.random.default_rng(seed)
+    if not orders:
+        return np.zeros(n_scenarios)
+
+    # 🔑 Wszystkie rozkłady w jednej tablicy + przesunięcia, żeby losować bez pętli po scenariuszach
+    pools = []
+    for order in orders:
+        rates = samples.get((order['Company'], order['Seal Type']))
+        if rates is None or len(rates) == 0:
+            rates = np.array([order['Average Time per Seal (minutes)']], dtype=float)
+        pools.append(rates)
+
+    lengths = np.array([len(rates) for rates in pools])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    quantities = np.array([order['Order Quantity'] for order in orders], dtype=float)
+    pool = np.concatenate(pools)
+
+    # 🎲 Jedno losowanie czasu na uszczelkę na zlecenie i scenariusz (uszczelki z jednej serii są skorelowane)
+    draws = offsets[:, None] + (rng.random((len(orders), n_scenarios)) * lengths[:, None]).astype(int)
+    total_minutes = (pool[draws] * quantities[:, None]).sum(axis=0)
+
+    # 📅 Kalendarz dostępnych minut i wyszukiwanie dnia zakończenia dla wszystkich scenariuszy naraz
+    capacity = capacity_calendar(start_datetime.date(), seal_type, max_days + 1)
+    cumulative = np.cumsum(capacity)
+    day = np.searchsorted(cumulative, total_minutes, side='left')
+    finished = day < len(cumulative)
+    day = np.minimum(day, len(cumulative) - 1)
+    minutes_into_day = total_minutes - (cumulative[day] - capacity[day])
+
+    completion_minutes = np.where(finished, day * 1440 + minutes_into_day, np.inf)
+    return completion_minutes
+
+
+def completion_percentile(completion_minutes, start_datetime, q):
+    value = np.quantile(completion_minutes, q, method='inverted_cdf')
+    if not np.isfinite(value):
+        return None
+    return start_datetime + datetime.timedelta(minutes=float(value))
+
+
+def completion_probability(completion_minutes, start_datetime, end_datetime):
+    deadline = (end_datetime - start_datetime).total_seconds() / 60
+    return float(np.mean(completion_minutes <= deadline))
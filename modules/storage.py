@@ -0,0 +1,193 @@
+# Wspólny dostęp do Google Sheets dla aplikacji Streamlit i API
+import uuid
+import gspread
+import pandas as pd
+from gspread.utils import numericise_all, rowcol_to_a1
+from oauth2client.service_account import ServiceAccountCredentials
+
+SPREADSHEET_NAME = "ProductionManagerApp"
+USERS_WORKSHEET = "Users"
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/drive"
+]
+ORDER_COLUMNS = ['Date', 'Company', 'Operator', 'Seal Type', 'Seal Count', 'Profile', 'Production Time', 'Downtime', 'Reason for Downtime', 'Order ID']
+ORDER_ID_COLUMN = 'Order ID'
+LEGACY_ORDER_ID_PREFIX = "L"
+SEAL_TYPES = ['Standard Soft', 'Standard Hard', 'Custom Soft', 'Custom Hard', 'V-Rings', 'Stack', 'Special']  # Wspólna lista dla formularza, edycji i importu
+USER_COLUMNS = ['Username', 'Password', 'Role']
+APPEND_BATCH_SIZE = 5000  # Duże paczki zamiast przepisywania arkusza
+
+# Wynik zapisu jednego zlecenia po Order ID
+ORDER_SAVED = "saved"
+ORDER_NOT_FOUND = "not_found"
+NO_ORDER_ID_COLUMN = "no_order_id_column"
+
+
+def connect_to_gsheets(credentials):
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials, SCOPE)
+    return gspread.authorize(creds)
+
+
+def open_spreadsheet(client):
+    return client.open(SPREADSHEET_NAME)
+
+
+def orders_sheet(client):
+    return open_spreadsheet(client).sheet1
+
+
+def spreadsheet_revision(spreadsheet):
+    # 🔑 Czas ostatniej modyfikacji pliku z Drive API (get_lastUpdateTime w gspread 6, lastUpdateTime w 5)
+    get_last_update_time = getattr(spreadsheet, 'get_lastUpdateTime', None)
+    if get_last_update_time is not None:
+        return get_last_update_time()
+    return spreadsheet.lastUpdateTime
+
+
+def load_users(client):
+    sheet = client.open(SPREADSHEET_NAME).worksheet(USERS_WORKSHEET)
+    data = sheet.get_all_records()
+    if data:
+        return pd.DataFrame(data)
+    return pd.DataFrame(columns=USER_COLUMNS)
+
+
+def new_order_ids(count):
+    # ✅ Prefiks "O" - sam hex (np. "1234e5...") arkusz i numericise_all zamieniają na liczbę
+    return ["O" + uuid.uuid4().hex[:12] for _ in range(count)]
+
+
+def legacy_order_ids(df):
+    # 🔑 Wiersze zapisane przed wprowadzeniem Order ID - stały identyfikator z treści wiersza (+ numer powtórzenia)
+    content = df.drop(columns=[ORDER_ID_COLUMN], errors='ignore').astype(str)
+    hashes = pd.util.hash_pandas_object(content, index=False).astype(str)
+    occurrence = hashes.groupby(hashes).cumcount().astype(str)
+    return LEGACY_ORDER_ID_PREFIX + hashes.str[-11:] + "-" + occurrence
+
+
+def fill_order_ids(df):
+    # 🔑 Identyfikatory liczone z surowych wierszy arkusza (przed parsowaniem dat), żeby zgadzały się z backfillem
+    if ORDER_ID_COLUMN not in df.columns:
+        df[ORDER_ID_COLUMN] = ""
+    order_ids = df[ORDER_ID_COLUMN].astype(str).str.strip()
+    missing = order_ids == ""
+    if missing.any():
+        order_ids = order_ids.where(~missing, legacy_order_ids(df))
+    df[ORDER_ID_COLUMN] = order_ids
+    return df
+
+
+def records_to_orders(data):
+    if not data:
+        return pd.DataFrame(columns=ORDER_COLUMNS)
+    df = fill_order_ids(pd.DataFrame(data))
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date  # ✅ Tylko data, bez godzin
+    return df.dropna(subset=['Date']).reset_index(drop=True)
+
+
+def values_to_records(header, rows):
+    # ✅ Surowe wartości z arkusza -> rekordy jak z get_all_records()
+    width = len(header)
+    return [dict(zip(header, numericise_all((row + [""] * width)[:width]))) for row in rows]
+
+
+def values_to_orders(header, rows):
+    return records_to_orders(values_to_records(header, rows))
+
+
+def sheet_order_ids(header, rows):
+    # Order ID każdego wiersza arkusza (w kolejności wierszy) - zapisany albo wyliczony z treści
+    if not rows:
+        return []
+    return fill_order_ids(pd.DataFrame(values_to_records(header, rows), columns=header))[ORDER_ID_COLUMN].tolist()
+
+
+def load_orders(client):
+    return records_to_orders(orders_sheet(client).get_all_records())
+
+
+def save_orders(client, dataframe):
+    sheet = orders_sheet(client)
+    dataframe = dataframe.astype(str)
+    sheet.clear()
+    sheet.update([dataframe.columns.values.tolist()] + dataframe.values.tolist())
+
+
+def append_orders(client, dataframe):
+    sheet = orders_sheet(client)
+    header = sheet.row_values(1)
+    if not header:
+        header = dataframe.columns.values.tolist()
+        sheet.append_row(header)
+    elif ORDER_ID_COLUMN in dataframe.columns and ORDER_ID_COLUMN not in header:
+        add_order_id_column(sheet, header)
+
+    # ✅ Kolejność kolumn zgodna z nagłówkiem arkusza
+    rows = dataframe.reindex(columns=header).fillna("").astype(str).values.tolist()
+    for start in range(0, len(rows), APPEND_BATCH_SIZE):
+        sheet.append_rows(rows[start:start + APPEND_BATCH_SIZE])
+
+
+def add_order_id_column(sheet, header):
+    # ✅ Starsze arkusze - kolumna Order ID razem z identyfikatorami istniejących wierszy (jedna aktualizacja),
+    # te same, które aplikacja wyliczyła już z treści wierszy
+    rows = sheet.get_all_values()[1:]
+    column = len(header) + 1
+    if column > sheet.col_count:
+        sheet.add_cols(1)
+    order_ids = sheet_order_ids(header, rows)
+    sheet.update(range_name=rowcol_to_a1(1, column), values=[[ORDER_ID_COLUMN]] + [[order_id] for order_id in order_ids])
+    header.append(ORDER_ID_COLUMN)
+
+
+def find_order_row(sheet, order_id):
+    # 🔍 Numer wiersza w arkuszu dla Order ID (None, jeśli arkusz nie ma jeszcze kolumny Order ID)
+    header = sheet.row_values(1)
+    if ORDER_ID_COLUMN not in header:
+        return header, None
+    cell = sheet.find(order_id, in_column=header.index(ORDER_ID_COLUMN) + 1)
+    if cell is not None:
+        return header, cell.row
+    if not order_id.startswith(LEGACY_ORDER_ID_PREFIX):
+        return header, None
+    # 🔍 Wiersz z pustym Order ID - identyfikator wyliczony z treści (zapis wiersza uzupełnia go w arkuszu)
+    rows = sheet.get_all_values()[1:]
+    order_ids = sheet_order_ids(header, rows)
+    return header, order_ids.index(order_id) + 2 if order_id in order_ids else None
+
+
+def _missing_order_status(header):
+    return NO_ORDER_ID_COLUMN if ORDER_ID_COLUMN not in header else ORDER_NOT_FOUND
+
+
+def update_order(client, order_id, values):
+    # ✏️ Zapis jednego wiersza zamiast przepisywania całego arkusza
+    sheet = orders_sheet(client)
+    header, row = find_order_row(sheet, order_id)
+    if row is None:
+        return _missing_order_status(header)
+    row_values = [str(values.get(column, "")) for column in header]
+    sheet.update(range_name=f"A{row}", values=[row_values])
+    return ORDER_SAVED
+
+
+def delete_order(client, order_id):
+    sheet = orders_sheet(client)
+    header, row = find_order_row(sheet, order_id)
+    if row is None:
+        return _missing_order_status(header)
+    sheet.delete_rows(row)
+    return ORDER_SAVED
+
+
+def save_users(client, users_df):
+    spreadsheet = client.open(SPREADSHEET_NAME)
+    try:
+        sheet = spreadsheet.worksheet(USERS_WORKSHEET)
+    except gspread.exceptions.WorksheetNotFound:
+        sheet = spreadsheet.add_worksheet(title=USERS_WORKSHEET, rows="100", cols="20")
+    sheet.clear()
+    sheet.update([users_df.columns.values.tolist()] + users_df.values.tolist())
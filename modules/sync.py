@@ -0,0 +1,84 @@
+import hashlib
+import pandas as pd
+from modules import storage
+
+POLL_INTERVAL = 15  # Sekundy między sprawdzeniami rewizji arkusza
+
+UNCHANGED = "unchanged"
+DELTA = "delta"
+RELOAD = "reload"
+
+
+def row_checksum(row):
+    # ✅ get() obcina puste komórki na końcu, get_all_values() nie - porównujemy bez nich
+    values = list(row)
+    while values and values[-1] == "":
+        values.pop()
+    return hashlib.md5("\x1f".join(values).encode('utf-8')).digest()
+
+
+class OrderSync:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self.sheet = spreadsheet.sheet1
+        self.revision = None
+        self.reload()
+
+    def reload(self):
+        # 🔄 Pełne wczytanie - rewizja pobrana przed odczytem, zapisana dopiero po udanym odczycie
+        revision = storage.spreadsheet_revision(self.spreadsheet)
+        values = self.sheet.get_all_values()
+        self._load(revision, values, [row_checksum(row) for row in values[1:]])
+
+    def _load(self, revision, values, checksums):
+        self.header = values[0] if values else []
+        self.header_checksum = row_checksum(self.header)  # np. dopisana kolumna Order ID wymaga pełnego wczytania
+        self.checksums = checksums  # Suma kontrolna każdego wiersza danych - wykrywa edycje, nie tylko dopisania
+        self.frame = storage.values_to_orders(self.header, values[1:])
+        self.revision = revision
+
+    def _append_rows(self, rows):
+        new_orders = storage.values_to_orders(self.header, rows)
+        self.frame = pd.concat([self.frame, new_orders], ignore_index=True)
+        self.checksums = self.checksums + [row_checksum(row) for row in rows]
+        return new_orders
+
+    def _read_appended(self, appended):
+        # ⚡ Po własnym dopisaniu: nagłówek + wiersze od ostatniego znanego w jednym zapytaniu
+        header, values = self.sheet.batch_get(["1:1", f"A{len(self.checksums) + 1}:ZZ"])
+        if (row_checksum(header[0] if header else []) != self.header_checksum
+                or not values or row_checksum(values[0]) != self.checksums[-1]
+                or len(values) - 1 != appended):
+            return None  # Zmieniony nagłówek, edycja albo cudze dopisanie - pełne porównanie
+        return self._append_rows(values[1:])
+
+    def _compare(self, revision):
+        # 🔍 Pełny odczyt porównany wiersz po wierszu - DELTA tylko, gdy zmiana to wyłącznie dopisane wiersze
+        values = self.sheet.get_all_values()
+        rows = values[1:]
+        checksums = [row_checksum(row) for row in rows]
+        known = len(self.checksums)
+        header = values[0] if values else []
+        if row_checksum(header) != self.header_checksum or checksums[:known] != self.checksums:
+            self._load(revision, values, checksums)
+            return RELOAD, None
+
+        self.revision = revision
+        if len(checksums) == known:
+            return UNCHANGED, None
+        return DELTA, self._append_rows(rows[known:])
+
+    def poll(self, force=False, appended=0):
+        # appended > 0 po własnym dopisaniu - wystarczy odczyt od ostatniego znanego wiersza.
+        # Rewizja nie jest wtedy przesuwana, więc najbliższe zwykłe sprawdzenie porówna cały arkusz
+        # i wychwyci ewentualne równoległe edycje (bez zmian -> UNCHANGED, bez komunikatu).
+        if appended and self.checksums:
+            new_orders = self._read_appended(appended)
+            if new_orders is not None:
+                return DELTA, new_orders
+
+        # 🔍 Tania rewizja (czas modyfikacji pliku) zamiast pobierania całego arkusza
+        revision = storage.spreadsheet_revision(self.spreadsheet)
+        if revision == self.revision and not force:
+            return UNCHANGED, None
+        return self._compare(revision)
@@ -0,0 +1,135 @@
+import pandas as pd
+from collections import deque
+
+EWMA_ALPHA = 0.3  # Waga najnowszego zlecenia w średniej wykładniczej
+ROLLING_WINDOW = 20  # Liczba ostatnich zleceń w oknie kroczącym
+
+
+class ThroughputStats:
+    __slots__ = ('ewma_seals', 'ewma_minutes', 'window', 'window_seals', 'window_minutes', 'orders')
+
+    def __init__(self):
+        self.ewma_seals = None
+        self.ewma_minutes = None
+        self.window = deque()
+        self.window_seals = 0.0
+        self.window_minutes = 0.0
+        self.orders = 0
+
+    def copy(self):
+        stats = ThroughputStats()
+        stats.ewma_seals = self.ewma_seals
+        stats.ewma_minutes = self.ewma_minutes
+        stats.window = deque(self.window)  # Najwyżej ROLLING_WINDOW elementów
+        stats.window_seals = self.window_seals
+        stats.window_minutes = self.window_minutes
+        stats.orders = self.orders
+        return stats
+
+    def update(self, seals, minutes):
+        # 🔥 O(1): średnia wykładnicza osobno dla uszczelek i minut (odporna na małe zlecenia)
+        if self.ewma_seals is None:
+            self.ewma_seals = seals
+            self.ewma_minutes = minutes
+        else:
+            self.ewma_seals = EWMA_ALPHA * seals + (1 - EWMA_ALPHA) * self.ewma_seals
+            self.ewma_minutes = EWMA_ALPHA * minutes + (1 - EWMA_ALPHA) * self.ewma_minutes
+
+        # 🔥 O(1): okno kroczące z bieżącymi sumami
+        self.window.append((seals, minutes))
+        self.window_seals += seals
+        self.window_minutes += minutes
+        if len(self.window) > ROLLING_WINDOW:
+            old_seals, old_minutes = self.window.popleft()
+            self.window_seals -= old_seals
+            self.window_minutes -= old_minutes
+
+        self.orders += 1
+
+    @property
+    def ewma_upm(self):
+        if not self.ewma_minutes:
+            return 0
+        return self.ewma_seals / self.ewma_minutes
+
+    @property
+    def rolling_upm(self):
+        if self.window_minutes <= 0:
+            return 0
+        return self.window_seals / self.window_minutes
+
+
+class ThroughputModel:
+    def __init__(self):
+        self.stats = {}
+        self.order_count = 0
+
+    @classmethod
+    def from_dataframe(cls, df):
+        model = cls()
+        if df.empty:
+            return model
+
+        history = pd.DataFrame({
+            'Date': pd.to_datetime(df['Date'], errors='coerce'),
+            'Company': df['Company'],
+            'Seal Type': df['Seal Type'],
+            'Operator': df['Operator'],
+            'Seal Count': pd.to_numeric(df['Seal Count'], errors='coerce'),
+            'Production Time': pd.to_numeric(df['Production Time'], errors='coerce'),
+        })
+        # ✅ Kolejność chronologiczna, żeby najnowsze zlecenia miały największą wagę
+        history = history.sort_values('Date', kind='stable')
+
+        for company, seal_type, operator, seals, minutes in zip(
+            history['Company'], history['Seal Type'], history['Operator'],
+            history['Seal Count'], history['Production Time']
+        ):
+            model._add(company, seal_type, operator, seals, minutes)
+
+        model.order_count = len(df)
+        return model
+
+    def _add(self, company, seal_type, operator, seals, minutes, copied=None):
+        if pd.isna(seals) or pd.isna(minutes) or seals <= 0 or minutes <= 0:
+            return
+
+        # 🔑 Statystyki per operator oraz zbiorcze dla firmy i typu uszczelki
+        for key in ((company, seal_type, operator), (company, seal_type, None)):
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = ThroughputStats()
+            elif copied is not None and key not in copied:
+                stats = self.stats[key] = stats.copy()  # Poprzednia wersja modelu zostaje nietknięta
+            if copied is not None:
+                copied.add(key)
+            stats.update(float(seals), float(minutes))
+
+    def updated(self, entries):
+        # 🔥 Nowa wersja modelu: płytka kopia słownika, kopiowane są tylko statystyki, których dotyczą nowe zlecenia
+        model = ThroughputModel()
+        model.stats = dict(self.stats)
+        model.order_count = self.order_count
+        copied = set()
+        for entry in entries:
+            model._add(
+                entry['Company'],
+                entry['Seal Type'],
+                entry['Operator'],
+                pd.to_numeric(entry['Seal Count'], errors='coerce'),
+                pd.to_numeric(entry['Production Time'], errors='coerce'),
+                copied,
+            )
+            model.order_count += 1
+        return model
+
+    def get(self, company, seal_type, operator=None):
+        return self.stats.get((company, seal_type, operator))
+
+    def operators(self, company, seal_type):
+        return sorted(
+            (key[2] for key in self.stats
+             if key[0] == company and key[1] == seal_type and key[2] is not None),
+            key=str
+        )
+